@@ -10,6 +10,19 @@ import data
 import plotting
 import config
 
+# converts percentage flux errors into magnitude errors. See
+# Cluster.percent_flux_errors_to_mag_errors_arr for where this comes from.
+_INV_LN10_25 = 2.5 / np.log(10)
+
+# formats of the pieces of a line of the RS catalog, written by
+# Cluster.rs_catalog. There is one photometry piece per band, and one RS piece
+# per color. These match the widths of the header. They are bytes, since the
+# catalog is written as bytes.
+_RS_COORDS_FMT = b"  %-12.7f %-12.7f"
+_RS_PHOT_FMT = b" %-15.3f %-15.3f"
+_RS_CENTER_FMT = b" %-7d"
+_RS_MEMBER_FMT = b" %-10d"
+
 
 class Cluster(object):
     """
@@ -20,10 +33,15 @@ class Cluster(object):
     # Keeping the predictions for the red sequence with the cluster object
     # made things a lot easier. And since the predictions are the same for
     # all cluster, this is a class variable rather than an instance variable.
-    # The regular one is for fitting, the low res one is for plotting all the
-    # models at once
+    # The regular one is for fitting, the low res one is for the quick initial
+    # redshift estimate and for plotting all the models at once. Since these
+    # are made once when the class is created, no fit ever rebuilds them.
     models = model.model_dict(0.01)
     low_res_models = model.model_dict(0.05)
+    # The fitting compares the data to the models at all redshifts at once,
+    # so we also keep the models as arrays.
+    model_arrays = model.model_arrays(models)
+    low_res_model_arrays = model.model_arrays(low_res_models)
 
     def __init__(self, file_path, params):
         """
@@ -51,6 +69,22 @@ class Cluster(object):
         self.center_ra = None
         self.center_dec = None
 
+        # The fitting works on arrays holding the data of all the sources,
+        # rather than on the sources one at a time. The positions and mags
+        # are filled straight from the catalog by read_catalog, and the
+        # colors by _build_arrays the first time they are needed. The mags
+        # are keyed by band, and the colors and RS membership by color.
+        self._arr_ra = None
+        self._arr_dec = None
+        self._arr_dist = None
+        self._arr_mag = dict()
+        self._arr_mag_err = dict()
+        self._arr_color = dict()
+        self._arr_color_err = dict()
+        self._arr_good_color_err = dict()
+        self._near_center = None
+        self._rs_member = dict()
+
         # then read in the objects in the catalog
         self.read_catalog(file_path, params)
 
@@ -73,46 +107,96 @@ class Cluster(object):
     def read_catalog(self, file_path, params):
         """ Read the catalog, parsing things into sources.
 
-        This function calls other functions to do the dirty work.
+        The whole catalog is parsed into an array at once, which is much
+        faster than going through it line by line. This function then calls
+        other functions to pull the columns we need out of that array.
 
         :param file_path: path of the catalog to be parsed.
         :param params: parameter dictionary
         :return: none, but the cluster's source list variable is populated.
         """
 
-        with open(file_path) as cat:
-            for line_num, line in enumerate(cat, start=1):
-                # some catalog formats aren't formatted the way I'd like (the
-                # column headers aren't commented out), so ignore that line.
-                if not line.startswith("#") and not line.strip().startswith("id"):
-                    # split the line, to make for easier parsing.
-                    split_line = [self.to_float(i) for i in line.split()]
-
-                    # get the various things from the parser functions.
-                    ra, dec = self.get_ra_dec(params, split_line, line_num)
-                    mags = self.get_mags(params, split_line, line_num)
-                    dist = self.get_dist(params, split_line, line_num)
-
-                    # check that the user has specified the appropriate things.
-                    if ra is None and dec is None and dist is None:
-                        raise TypeError("Specify one of either ra/dec or dist")
-
-                    # turn this info into a source object, then add it.
-                    this_source = Source(ra, dec, mags, dist)
-                    self.sources_list.append(this_source)
+        # which columns hold what, which bands we have, and how to turn them
+        # into AB mags are the same for every source, so we figure all that
+        # out once before touching the catalog itself.
+        bands = self._bands(params)
+        vega_offsets = self._vega_offsets(params, bands)
+        columns = self._column_indices(params, bands)
 
-    @staticmethod
-    def to_float(item):
-        """If an item can be converted to a float, it will be. If not, the item
-        will be returned unchanged.
-
-        :param item: Item to potentially convert to a float.
-        :return: the item, potentially converted to a float.
-        """
-        try:
-            return float(item)
-        except ValueError:  # That's the error from a failed float conversion.
-            return item
+        with open(file_path) as cat:
+            # some catalog formats aren't formatted the way I'd like (the
+            # column headers aren't commented out), so ignore that line. We
+            # also ignore blank lines and comments, even indented ones.
+            lines = [line for line in cat if line.strip() and
+                     not line.lstrip().startswith("#") and
+                     not line.strip().startswith("id")]
+
+        if len(lines) == 0:
+            # an empty catalog has no rows, but still needs all the columns
+            # so that the arrays below come out empty.
+            num_columns = max(abs(idx) for idx in columns.values()
+                              if idx is not None) + 1
+            catalog = np.empty((0, num_columns), dtype=np.float64)
+        else:
+            # parse everything at once. Anything that isn't a number turns
+            # into nan, which is fine since we only use the numerical columns.
+            try:
+                catalog = np.genfromtxt(lines, dtype=np.float64)
+            except ValueError:  # the lines have different numbers of columns
+                raise ValueError("Not all the lines in the {} catalog have\n"
+                                 "\tthe same number of columns. Check the\n"
+                                 "\tformatting of that catalog."
+                                 "".format(self.name))
+            # a catalog with only one line comes out as a 1D array.
+            catalog = np.atleast_2d(catalog)
+            # genfromtxt can still skip lines we kept, so make sure we got
+            # one row per line. Otherwise the columns would be misread.
+            if catalog.shape[0] != len(lines):
+                raise ValueError("Not all the lines in the {} catalog have\n"
+                                 "\tthe same number of columns. Check the\n"
+                                 "\tformatting of that catalog."
+                                 "".format(self.name))
+
+        # get the various things from the parser functions. These are all
+        # columns of the catalog.
+        ras, decs = self.get_ra_dec(columns, catalog)
+        mags = self.get_mags(params, catalog, columns, bands, vega_offsets)
+        dists = self.get_dist(columns, catalog)
+
+        # check that the user has specified the appropriate things.
+        if ras is None and decs is None and dists is None:
+            raise TypeError("Specify one of either ra/dec or dist")
+
+        # keep the columns as arrays for the fitting. We copy them so they
+        # are contiguous and don't keep the whole catalog alive.
+        self._arr_ra = np.ascontiguousarray(ras)
+        self._arr_dec = np.ascontiguousarray(decs)
+        if dists is not None:
+            self._arr_dist = np.ascontiguousarray(dists)
+        for band, (values, errors) in mags.items():
+            self._arr_mag[band] = np.ascontiguousarray(values)
+            self._arr_mag_err[band] = np.ascontiguousarray(errors)
+
+        # the sources want plain numbers, not arrays, so turn the columns into
+        # lists before going through them.
+        ras = ras.tolist()
+        decs = decs.tolist()
+        if dists is None:
+            dists = [None] * len(ras)
+        else:
+            dists = dists.tolist()
+        mags = [(band, values.tolist(), errors.tolist())
+                for band, (values, errors) in mags.items()]
+
+        for idx in range(len(ras)):
+            # turn the photometry into Data objects for this source.
+            source_mags = dict()
+            for band, values, errors in mags:
+                source_mags[band] = data.Data(values[idx], errors[idx])
+
+            # turn this info into a source object, then add it.
+            this_source = Source(ras[idx], decs[idx], source_mags, dists[idx])
+            self.sources_list.append(this_source)
 
     @staticmethod
     def _check_valid_int(params, key):
@@ -136,62 +220,76 @@ class Cluster(object):
                              "\tused by the code. Please remove it."
                              "".format(key))
 
-    def _check_valid_idx(self, split_line, idx, line_number):
+    def _check_valid_idx(self, catalog, idx):
         """
-        See whether a given index is valid, given the line that is supposed
-        to index. If the index is invalid, we raise an error and explain what
-        went wront to the user.
-
-        :param split_line: Line that has been split into a list of items.
-        :type split_line: list
-        :param idx: Index that is supposed to be used on split_line.
+        See whether a given column index is valid, given the catalog that is
+        supposed to be indexed. If the index is invalid, we raise an error and
+        explain what went wront to the user.
+
+        :param catalog: 2D array holding the catalog, where the first index
+                        is the line and the second is the column.
+        :type catalog: np.ndarray
+        :param idx: Index of the column we want out of catalog.
         :type idx: int
-        :param line_number: Line number in the catalog that split_line
-               holds the data for. Only used in error messages if something
-               goes wrong.
-        :type line_number: int
-        :return: The value of split_line[idx]. If that doesn't exist, we raise
+        :return: The column catalog[:, idx]. If that doesn't exist, we raise
                  an error.
         """
         try:
-            return split_line[idx]
+            return catalog[:, idx]
         except IndexError:
-            raise ValueError("The indexing appears to be broken on line {}\n"
-                             "\tof the {} catalog.\n "
+            raise ValueError("The indexing appears to be broken for\n"
+                             "\tcolumn {} of the {} catalog.\n "
                              "\tCheck the indexes in the param file, as well\n"
-                             "\tas the line in that catalog itself."
-                             "".format(line_number, self.name))
+                             "\tas the catalog itself."
+                             "".format(idx, self.name))
 
-    def get_ra_dec(self, params, split_line, line_number):
-        """Parses the line to get the ra and dec.
+    @staticmethod
+    def _column_indices(params, bands):
+        """ Turns the column indices in the param file into integers.
 
-        If the user doesn't specify ra and dec, then return None.
+        This checks all of them at once, so the functions that pull the
+        columns out of the catalog only have to do the indexing.
 
         :param params: Parameter dictionary that is passed all around the code.
-        :param split_line: Line of the catalog split into the components.
-        :param line_number: Line number in the catalog. Only used for error
-                            messages if something doesn't work.
-        :return: ra and dec as a tuple
+        :param bands: list of the bands in the catalog, from _bands().
+        :return: dictionary with keys of the parameter names (ra, dec, dist,
+                 and the bands and their errors), and values of the column
+                 index of that quantity. Dist is None if the catalog doesn't
+                 have it.
         """
+        columns = dict()
+        columns["ra"] = Cluster._check_valid_int(params, "ra")
+        columns["dec"] = Cluster._check_valid_int(params, "dec")
+        if params["dist"] != "-99":  # -99 means its not in the catalog.
+            columns["dist"] = Cluster._check_valid_int(params, "dist")
+        else:
+            columns["dist"] = None
+        for band in bands:
+            columns[band] = Cluster._check_valid_int(params, band)
+            columns[band + "_err"] = Cluster._check_valid_int(params,
+                                                              band + "_err")
+        return columns
 
-        ra_idx = self._check_valid_int(params, "ra")
-        dec_idx = self._check_valid_int(params, "dec")
-        ra = self._check_valid_idx(split_line, ra_idx, line_number)
-        dec = self._check_valid_idx(split_line, dec_idx, line_number)
+    def get_ra_dec(self, columns, catalog):
+        """Parses the catalog to get the ra and dec.
 
-        return ra, dec
+        :param columns: dictionary of column indices, from _column_indices().
+        :param catalog: 2D array holding the catalog.
+        :return: arrays of ra and dec as a tuple
+        """
 
-    def get_mags(self, params, split_line, line_number):
-        """ Parses the config file to get the magnitudes.
+        ras = self._check_valid_idx(catalog, columns["ra"])
+        decs = self._check_valid_idx(catalog, columns["dec"])
+
+        return ras, decs
+
+    @staticmethod
+    def _bands(params):
+        """ Figures out which bands were specified in the param file.
 
         :param params: Parameter dictionary that is passed all around the code.
-        :param split_line: Line of the catalog split into the components.
-        :param line_number: Line number in the catalog. Only used for error
-                            messages if something doesn't work.
-        :return: dictionary with keys of band names (eg: ch1, r, z), and values
-                 of data objects with the mag and mag error in that band.
+        :return: list of the names of the bands (eg: ch1, r, z).
         """
-        # see which bands were specified in the param file
         non_band_params = ["catalog_directory", "extension",
                            "plot_directory", "results_file", "rs_catalog_dir",
                            "type", "mag_zeropoint", "mag_system", "ra", "dec",
@@ -215,123 +313,189 @@ class Cluster(object):
                                      "\tparameter is something other than\n"
                                      "\ta band, please remove it. It is not\n"
                                      "\tneeded by the code.".format(key))
+        return bands
+
+    @staticmethod
+    def _vega_offsets(params, bands):
+        """ Finds what needs to be subtracted from the catalog mags in each
+        band to turn them into AB mags.
+
+        :param params: Parameter dictionary that is passed all around the code.
+        :param bands: list of the bands in the catalog.
+        :return: dictionary with keys of band names, and values of the offset
+                 to subtract. These are zero unless the catalog has Vega mags.
+                 If we had flux, the mags will be AB already.
+        """
+        offsets = dict()
+        for band in bands:
+            if params["type"] == "mag" and params["mag_system"] == "vega":
+                try:
+                    offsets[band] = config.ab_to_vega[band]
+                except KeyError:
+                    raise KeyError("Please specify the AB/Vega conversion "
+                                   "\tfor {} in config.py.".format(band))
+            else:
+                offsets[band] = 0
+        return offsets
 
+    def get_mags(self, params, catalog, columns, bands, vega_offsets):
+        """ Parses the config file to get the magnitudes.
+
+        :param params: Parameter dictionary that is passed all around the code.
+        :param catalog: 2D array holding the catalog.
+        :param columns: dictionary of column indices, from _column_indices().
+        :param bands: list of the bands in the catalog, from _bands().
+        :param vega_offsets: dictionary with the offsets needed to turn the
+                             mags in each band into AB mags, from
+                             _vega_offsets().
+        :return: dictionary with keys of band names (eg: ch1, r, z), and values
+                 of tuples holding arrays of the mags and mag errors of all the
+                 sources in that band.
+        """
         # then we are ready to get the info for the bands we identified
         mags = dict()
         for band in bands:
-            # verify the indicies the user specified, and then get the data.
-            band_idx = self._check_valid_int(params, band)
-            band_err_idx = self._check_valid_int(params, band + "_err")
-
-            band_data = self._check_valid_idx(split_line, band_idx,
-                                              line_number)
-            band_data_err = self._check_valid_idx(split_line, band_err_idx,
-                                                  line_number)
+            # get the data out of the columns the user specified.
+            band_data = self._check_valid_idx(catalog, columns[band])
+            band_data_err = self._check_valid_idx(catalog,
+                                                  columns[band + "_err"])
 
             # convert fluxes to magnitudes if need be
             if params["type"] == "flux":
-                if band_data == 0:
-                    # give it a slightly negative flux, which will be
-                    # interpreted as a bad mag
-                    band_data = -0.1
+                # give zero fluxes a slightly negative flux, which will be
+                # interpreted as a bad mag
+                band_data = np.where(band_data == 0, -0.1, band_data)
                 # calculate magnitude err first, since we need to use the flux
                 # to calculate the magnitude.
-                band_data_err = Cluster.percent_flux_errors_to_mag_errors(
+                band_data_err = Cluster.percent_flux_errors_to_mag_errors_arr(
                     band_data_err / band_data)
-                band_data = Cluster.flux_to_mag(band_data,
-                                                params["mag_zeropoint"])
+                band_data = Cluster.flux_to_mag_arr(band_data,
+                                                    params["mag_zeropoint"])
 
-            # Convert to AB mags if needed. If we had flux, they are AB already
-            if params["type"] == "mag" and params["mag_system"] == "vega":
-                try:
-                    band_data -= config.ab_to_vega[band]
-                except KeyError:
-                    raise KeyError("Please specify the AB/Vega conversion "
-                                   "\tfor {} in config.py.".format(band))
+            # Convert to AB mags if needed.
+            if vega_offsets[band] != 0:
+                band_data = band_data - vega_offsets[band]
 
-            # convert to Data type, and add to dictionary
-            mags[band] = data.Data(band_data, band_data_err)
+            # add the mags and errors to the dictionary
+            mags[band] = (band_data, band_data_err)
 
         return mags
 
-    def get_dist(self, params, split_line, line_number):
-        """Parse the line to get the distance from center.
+    def get_dist(self, columns, catalog):
+        """Parse the catalog to get the distance from center.
 
-        :param params: Parameter dictionary that is passed all around the code.
-        :param split_line: Line of the catalog split into the components.
-        :param line_number: Line number of this line in the catalog. Only used
-                            for error checking.
-        :return: The distance of the object from the cluster center.
+        :param columns: dictionary of column indices, from _column_indices().
+        :param catalog: 2D array holding the catalog.
+        :return: Array of the distances of the objects from the cluster center,
+                 or None if the catalog doesn't have them.
         """
-        if params["dist"] != "-99":  # -99 means its not in the catalog.
-            dist_idx = self._check_valid_int(params, "dist")
-            return self._check_valid_idx(split_line, dist_idx, line_number)
+        if columns["dist"] is not None:
+            return self._check_valid_idx(catalog, columns["dist"])
         else:  # if the user didn't specify
             return None
 
     @staticmethod
-    def flux_to_mag(flux, zeropoint):
-        """Convert flux to magnitude with the given zeropoint.
+    def flux_to_mag_arr(flux, zeropoint):
+        """Convert an array of fluxes to magnitudes with the given zeropoint.
 
-        :param flux: flux in whatever units. Choose your zeropoint correctly
-                     to make this work with the units flux is in.
+        :param flux: array of fluxes in whatever units. Choose your zeropoint
+                     correctly to make this work with the units flux is in.
         :param zeropoint: zeropoint of the system, such that
                           m = -2.5 log(flux) + zeropoint
-        :return: magnitude that corresponds to the given flux. If flux is
-                 negative, -99 is returned.
+        :return: array of magnitudes that correspond to the given fluxes. Where
+                 the flux isn't positive, the magnitude is -99.
         """
-        if flux <= 0:
-            return -99
-        return -2.5 * np.log10(flux) + zeropoint
+        good = flux > 0
+        # bad fluxes are replaced with 1 before taking the log, just so numpy
+        # doesn't complain. They get replaced with -99 anyway.
+        return np.where(good, -2.5 * np.log10(np.where(good, flux, 1.0)) +
+                        zeropoint, -99.0)
 
     @staticmethod
-    def mag_to_flux(mag, zeropoint):
+    def mag_to_flux_arr(mag, zeropoint):
         """
-        Converts a magnitude into a flux, given the zeropoint of the mag system
+        Converts an array of magnitudes into fluxes, given the zeropoint of
+        the mag system.
 
-        :param mag: Magnitude
+        :param mag: array of magnitudes
         :param zeropoint: Zeropoint of the magnitude system, such that
                           m = -2.5 log(flux) + zeropoint
-        :return: flux corresponding to the given magnitude. If the mag is less
-                 than zero (which while physical, will only happen in this
-                 code if there is an error), -99 will be returned.
+        :return: array of fluxes corresponding to the given magnitudes. Where
+                 the mag is less than zero (which while physical, will only
+                 happen in this code if there is an error), the flux is -99.
         """
-        if mag < 0:
-            return -99
-        return 10 ** ((zeropoint - mag) / 2.5)
+        # bad mags are given a harmless exponent in the meantime, and get
+        # replaced with -99 at the end. The powers are taken one at a time,
+        # since numpy's power can be off from Python's in the last digit,
+        # which can change the rounding in the RS catalogs.
+        bad = mag < 0
+        exponents = (zeropoint - np.where(bad, zeropoint, mag)) / 2.5
+        flux = np.array([10 ** exponent for exponent in exponents.tolist()],
+                        dtype=np.float64)
+        flux[bad] = -99.0
+        return flux
 
     @staticmethod
-    def mag_errors_to_flux_errors(mag_error, flux):
+    def mag_errors_to_flux_errors_arr(mag_error, flux):
         """
-        Converts magnitude errors into flux errors.
-
-        :param mag_error: Magnitude error
-        :param flux: Flux of the object in question. This is needed since
-                     magnitude errors correspond to percentage flux errors.
-        :return:
+        Converts an array of magnitude errors into flux errors.
+
+        :param mag_error: array of magnitude errors
+        :param flux: array of fluxes of the objects in question. This is
+                     needed since magnitude errors correspond to percentage
+                     flux errors.
+        :return: array of flux errors. Where the flux is negative, the flux
+                 error is -99.
         """
-        if flux < 0:
-            return -99
-        return (flux * np.log(10) * mag_error) / 2.5
+        return np.where(flux < 0, -99.0,
+                        (flux * np.log(10) * mag_error) / 2.5)
 
     @staticmethod
-    def percent_flux_errors_to_mag_errors(percent_flux_error):
-        """Converts a percentage flux error into a magnitude error.
+    def percent_flux_errors_to_mag_errors_arr(percent_flux_error):
+        """Converts an array of percentage flux errors into magnitude errors.
 
         m = -2.5 log10(F) + C
         dm = -2.5/(ln(10)) dF/F
 
-        :param percent_flux_error: percentage flux error
-        :return: magnitude error corresponding to the percentage flux error.
+        :param percent_flux_error: array of percentage flux errors
+        :return: array of magnitude errors corresponding to the percentage
+                 flux errors. Where the percentage error is negative, the
+                 magnitude error is 99.
         """
-        if percent_flux_error < 0:
-            return 99
-        return (2.5 / np.log(10)) * percent_flux_error
+        return np.where(percent_flux_error < 0, 99.0,
+                        _INV_LN10_25 * percent_flux_error)
 
     def __repr__(self):
         return self.name
 
-    def fit_z(self, params, cfg):
+    def _build_arrays(self, cfg):
+        """
+        Calculates the colors of all the sources as arrays.
+
+        The fitting looks at every source many times, so having the data in
+        arrays lets it work on all the sources at once, rather than going
+        through them one at a time. The colors are made from the mag arrays
+        the same way Data objects do it: the values are subtracted, and the
+        errors are added in quadrature. This only does the work the first
+        time it is called for each color, since the data doesn't change.
+
+        :param cfg: Configuration dictionary for the color combo in question.
+        :return: None, but the cluster's color arrays are filled.
+        """
+        color = cfg["color"]
+        if color not in self._arr_color:
+            blue_band = cfg["blue_band"]
+            red_band = cfg["red_band"]
+            self._arr_color[color] = (self._arr_mag[blue_band] -
+                                      self._arr_mag[red_band])
+            self._arr_color_err[color] = np.sqrt(
+                self._arr_mag_err[blue_band]**2 +
+                self._arr_mag_err[red_band]**2)
+            # only sources with good colors can be RS members. This doesn't
+            # change, so we only need to check it once.
+            self._arr_good_color_err[color] = self._arr_color_err[color] < 0.2
+
+    def fit_z(self, params, cfg, pdf=None):
         """
         Find the redshift of the cluster by matching its red sequence the
         red sequence models produced by EzGal. This is the main
@@ -340,8 +504,15 @@ class Cluster(object):
         :param params: Dictionary full of the user's parameters for the
                        program from the config file.
         :param cfg: Configuration dictionary for the color combo in question.
+        :param pdf: Open PdfPages object to save the plots into as soon as
+                    they are made, which keeps them from piling up in memory.
+                    If this is None, the plots are kept in self.figures
+                    instead, to be saved later with save_as_one_pdf.
         :return: None, but the redshift of the cluster is set.
         """
+        # get the data the fitting needs into arrays
+        self._build_arrays(cfg)
+
         # do a location cut, to only focus on galaxies near the center of
         # the image.
         self._location_cut(1.0, params)  # 1.0 is in arcminutes
@@ -354,13 +525,11 @@ class Cluster(object):
 
         # If the user wants, plot the initial CMD with predictions
         if params["CMD"] == "1":
-            fig, ax = plt.subplots(figsize=(9, 6))
-            ax = plotting.cmd(self, ax, cfg)
-            vega_color_ax, vega_mag_ax = plotting.add_vega_labels(ax, cfg)
+            fig, ax, vega_color_ax, vega_mag_ax = self._cmd_figure(cfg)
             plotting.add_all_models(fig, ax,
                                     steal_axs=[ax, vega_color_ax, vega_mag_ax],
                                     cfg=cfg, models=self.low_res_models)
-            self.figures.append(fig)
+            self._keep_figure(fig, pdf)
 
         # Do a quick and dirty initial redshift fitting, to get a starting
         # point.
@@ -368,16 +537,10 @@ class Cluster(object):
 
         # If the user wants to see this initial fit, plot it.
         if params["fitting_procedure"] == "1":
-            # set up the plot
-            fig, ax = plt.subplots(figsize=(9, 6))
-            ax = plotting.cmd(self, ax, cfg)
-            plotting.add_vega_labels(ax, cfg)
-            # the following line is UGLY, and will unfortunately be
-            # repeated. The second parameter in the function call is the model
-            # in the correct color at the current redshift of the cluster.
-            plotting.add_one_model(ax, self.models[this_color][self.z[this_color].value], "k")
+            # set up the plot, with the model at the current redshift
+            fig, ax, _, _ = self._cmd_figure(cfg, self.z[this_color].value)
             plotting.add_redshift(ax, self.z[this_color].value)
-            self.figures.append(fig)
+            self._keep_figure(fig, pdf)
 
         # do iterations of fitting, each with a progressively smaller
         # color cut, which is designed to hone in on the red sequence.
@@ -395,12 +558,10 @@ class Cluster(object):
 
             # if the user wants, plot the procedure
             if params["fitting_procedure"] == "1":
-                fig, ax = plt.subplots(figsize=(9, 6))
-                ax = plotting.cmd(self, ax, cfg)
-                plotting.add_vega_labels(ax, cfg)
-                plotting.add_one_model(ax, self.models[this_color][self.z[this_color].value], "k")
+                fig, ax, _, _ = self._cmd_figure(cfg,
+                                                 self.z[this_color].value)
                 plotting.add_redshift(ax, self.z[this_color].value)
-                self.figures.append(fig)
+                self._keep_figure(fig, pdf)
 
         # See if there is a red cloud, rather than a clear red sequence.
         self._clean_rs_check(cfg)
@@ -419,11 +580,8 @@ class Cluster(object):
         # we now have a final answer for the redshift of the cluster.
         # if the user wants, plot it up
         if params["final_CMD"] == "1":
-            # set up the plot
-            fig, ax = plt.subplots(figsize=(9, 6))
-            ax = plotting.cmd(self, ax, cfg)
-            plotting.add_vega_labels(ax, cfg)
-            plotting.add_one_model(ax, self.models[this_color][self.z[this_color].value], "k")
+            # set up the plot, with the best fit model
+            fig, ax, _, _ = self._cmd_figure(cfg, self.z[this_color].value)
 
             # I want to plot the models that match the 1 sigma errors, so we
             # first need to get those redshifts
@@ -438,14 +596,14 @@ class Cluster(object):
                                    light_grey)
             plotting.add_redshift(ax, self.z[this_color])
 
-            self.figures.append(fig)
+            self._keep_figure(fig, pdf)
 
         # If the user wants, plot the location of the RS members.
         if params["location"] == "1":
             fig, ax = plt.subplots(figsize=(7, 7))
             ax = plotting.location(self, ax, this_color)
             plotting.add_redshift(ax, self.z[this_color])
-            self.figures.append(fig)
+            self._keep_figure(fig, pdf)
 
         # interactive mode requires some more work
         if params["interactive"] == "1":
@@ -490,6 +648,63 @@ class Cluster(object):
             elif flags == "i":  # interesting
                 self.interesting = 1
 
+        # now that the fit is done, copy the results into the sources.
+        self._update_sources(this_color)
+
+    def _update_sources(self, color):
+        """
+        Copies the distances, location cut, and red sequence membership from
+        the cluster's arrays into each source.
+
+        The fitting only uses the arrays, so this is done once at the end of
+        the fit, rather than every time they change. It's for anyone using
+        the sources themselves.
+
+        :param color: Color of the fit that was just done.
+        :return: None, but the sources are updated.
+        """
+        for source, dist, near_center, member in \
+                zip(self.sources_list, self._arr_dist.tolist(),
+                    self._near_center.tolist(),
+                    self._rs_member[color].tolist()):
+            source.dist = dist
+            source.near_center = near_center
+            source.RS_member[color] = member
+
+    def _keep_figure(self, fig, pdf):
+        """
+        Holds on to a figure made during the fitting, so it can be saved.
+
+        :param fig: Figure that was just made.
+        :param pdf: Open PdfPages object, or None. If we have one, the figure
+                    is saved into it right away and then closed. If not, the
+                    figure is added to self.figures.
+        :return: None
+        """
+        if pdf is not None:
+            pdf.savefig(fig)
+            plt.close(fig)
+        else:
+            self.figures.append(fig)
+
+    def _cmd_figure(self, cfg, model_z=None):
+        """
+        Makes a figure with the CMD of the cluster, labeled in both AB and
+        Vega mags. All the CMD plots start out this way.
+
+        :param cfg: Configuration dictionary for the color combo in question.
+        :param model_z: Redshift of a model to plot on the CMD in black. If
+                        this is None, no model is plotted.
+        :return: The figure, the CMD axis, and the Vega color and magnitude
+                 axes, which are needed if you want to add a colorbar.
+        """
+        fig, ax = plt.subplots(figsize=(9, 6))
+        ax = plotting.cmd(self, ax, cfg)
+        vega_color_ax, vega_mag_ax = plotting.add_vega_labels(ax, cfg)
+        if model_z is not None:
+            plotting.add_one_model(ax, self.models[cfg["color"]][model_z], "k")
+        return fig, ax, vega_color_ax, vega_mag_ax
+
     @staticmethod
     def _bin_edges(values, bin_size):
         """ Determines the bin edges given data and a bin size.
@@ -506,9 +721,10 @@ class Cluster(object):
         """
 
         # start with the lowest value in the data set as our lowest edge.
-        edges = [min(values)]
+        edges = [np.min(values)]
         # we will add an edge at a time until we have spanned all the values
-        while edges[-1] < max(values):
+        max_value = np.max(values)
+        while edges[-1] < max_value:
             edges.append(edges[-1] + bin_size)
 
         return edges
@@ -526,8 +742,8 @@ class Cluster(object):
         equivalent to the size of the core of the cluster. Then the highest
         value is picked as the center of the cluster.
 
-        :param ras: List of RA values we want to find a center for.
-        :param decs: List of dec values we want to find a center for.
+        :param ras: Array of RA values we want to find a center for.
+        :param decs: Array of dec values we want to find a center for.
         :return: Guesses for the RA and dec of the center of the cluster.
         """
 
@@ -542,7 +758,7 @@ class Cluster(object):
         #               delta ra = delta dec / cos(dec)
         # so since we have our dec bin size, we can get the ra bin size. We
         # will use the declination of the center of the image.
-        middle_dec = (max(decs) + min(decs)) / 2.0
+        middle_dec = (np.max(decs) + np.min(decs)) / 2.0
         ra_bin_size = dec_bin_size / np.cos(middle_dec * np.pi / 180.0)  # rads
 
         # we then make the bins themselves
@@ -571,8 +787,8 @@ class Cluster(object):
 
         # since we know the bin size, we can turn this into a coordinate
         # we add half a bin size to get to the center of each bin
-        ra_cen = min(ras) + ra_idx * ra_bin_size + ra_bin_size / 2.0
-        dec_cen = min(decs) + dec_idx * dec_bin_size + dec_bin_size / 2.0
+        ra_cen = np.min(ras) + ra_idx * ra_bin_size + ra_bin_size / 2.0
+        dec_cen = np.min(decs) + dec_idx * dec_bin_size + dec_bin_size / 2.0
 
         self.center_ra = ra_cen
         self.center_dec = dec_cen
@@ -593,36 +809,34 @@ class Cluster(object):
         not, calculate our own center.
 
         :param radius: radius of the cut, in arcminutes.
-        :return: None, but galaxies near the center are marked as having
-                 near_center = True.
+        :return: None, but galaxies near the center are marked as True in
+                 the cluster's near center array.
         """
 
         # first we need to get all the coordinates
-        ras = [source.ra for source in self.sources_list]
-        decs = [source.dec for source in self.sources_list]
+        ras = self._arr_ra
+        decs = self._arr_dec
 
         # we may need to find our own centers
         if params["dist"] == "-99":
             # get the center
             self._centering(ras, decs)
 
-            # then find the distance from the center for each source.
-            for source in self.sources_list:
-                # Use pythagorean theorem to find distance in degrees, then
-                # multiply by 3600 to convert to arcsec
-                dec_radians = self.center_dec * np.pi / 180.0
-                # we have to account for the cosine(dec) term in the
-                # ra separation
-                ra_sep = (source.ra - self.center_ra) * np.cos(dec_radians)
-                dec_sep = source.dec - self.center_dec
-                source.dist = np.sqrt(ra_sep**2 + dec_sep**2) * 3600
+            # then find the distance from the center for all the sources.
+            # Use pythagorean theorem to find distance in degrees, then
+            # multiply by 3600 to convert to arcsec
+            dec_radians = self.center_dec * np.pi / 180.0
+            # we have to account for the cosine(dec) term in the
+            # ra separation
+            ra_seps = (ras - self.center_ra) * np.cos(dec_radians)
+            dec_seps = decs - self.center_dec
+            dists = np.sqrt(ra_seps**2 + dec_seps**2) * 3600
+            self._arr_dist = dists
+        else:
+            dists = self._arr_dist
 
         # then set things as near the center if they are indeed near the center
-        for source in self.sources_list:
-            if source.dist < radius*60.0:  # convert radius to arcsec
-                source.near_center = True
-            else:
-                source.near_center = False
+        self._near_center = dists < radius*60.0  # convert radius to arcsec
 
     def _initial_z(self, cfg):
         """
@@ -640,59 +854,46 @@ class Cluster(object):
 
         # Get models with a large spacing, since we don't need a lot of
         # accuracy here.
-        models = self.low_res_models[cfg["color"]]
-
-        # set placeholder values that will be replaced as we go
-        max_nearby = -999
-        best_z = -999
-        z_nearby_pairs = []
-        # ^ will be list of tuples, where each tuple is the redshift and
-        # number of nearby galaxies
-
-        # Iterate through the redshifts
-        for z in sorted(models):
-            nearby = 0  # reset the number of nearby galaxies
-
-            # get the m* at this redshift
-            this_model = models[z]
-            mag_point = this_model.mag_point
-
-            # then iterate through the sources to see which are close to m*
-            for source in self.sources_list:
-                if source.near_center:
-                    # get the mag and color of the source
-                    source_mag = source.mags[cfg["red_band"]].value
-                    source_color = source.colors[cfg["color"]].value
-
-                    # get the expected RS color for a galaxy of this magnitude
-                    rs_color = this_model.rs_color(source.mags[cfg["red_band"]].value)
-
-                    # then determine the limits for a valid RS galaxy
-                    bright_mag = mag_point - cfg["initial_mag"][0]
-                    faint_mag = mag_point + cfg["initial_mag"][1]
-                    blue_color = rs_color - cfg["initial_color"][0]
-                    red_color = rs_color + cfg["initial_color"][1]
-                    # see if it passes a color and magnitude cut
-                    if (bright_mag < source_mag < faint_mag) and \
-                       (blue_color < source_color < red_color):
-                        # if it did pass, note that it is nearby
-                        nearby += 1
-
-            z_nearby_pairs.append((z, nearby))
-            # replace the best values if this is the best
-            if nearby > max_nearby:
-                max_nearby = nearby
-                best_z = z
-
-        redshifts, nearbies = zip(*z_nearby_pairs)
+        model_arrays = self.low_res_model_arrays[cfg["color"]]
+
+        # Only the sources near the center matter here, and their mags and
+        # colors don't change with redshift, so select them once.
+        source_mags = self._arr_mag[cfg["red_band"]][self._near_center]
+        source_colors = self._arr_color[cfg["color"]][self._near_center]
+
+        # get the expected RS color at the magnitude of each source for the
+        # models at all redshifts. This is a 2D array, where the first index
+        # is the redshift, and the second is the source.
+        rs_colors = model_arrays.rs_colors(source_mags)
+
+        # then determine the limits for a valid RS galaxy. The magnitude
+        # limits only depend on redshift, so we make them a column that can
+        # be compared to every source.
+        mag_points = model_arrays.mag_points[:, None]
+        bright_mags = mag_points - cfg["initial_mag"][0]
+        faint_mags = mag_points + cfg["initial_mag"][1]
+        blue_colors = rs_colors - cfg["initial_color"][0]
+        red_colors = rs_colors + cfg["initial_color"][1]
+        # at each redshift, count the ones that pass both the color and
+        # magnitude cut
+        nearbies = ((source_mags > bright_mags) &
+                    (source_mags < faint_mags) &
+                    (source_colors > blue_colors) &
+                    (source_colors < red_colors)).sum(axis=1)
+
+        # the best redshift is the one with the most nearby galaxies. If
+        # there is a tie, the lowest redshift wins.
+        best_z = model_arrays.zs[int(np.argmax(nearbies))]
+        nearbies = nearbies.tolist()
 
         # check for the double red sequence
         self._double_red_sequence(nearbies, cfg["color"])
 
         # Turn this into a data object, with errors that span the maximum
-        # range, since we don't have a good feeling yet
-        up_error = sorted(models.keys())[-1] - best_z  # max z - best
-        low_error = best_z - sorted(models.keys())[0]  # best - min z
+        # range, since we don't have a good feeling yet. The redshifts are
+        # already sorted, so the ends are the min and max.
+        up_error = model_arrays.zs[-1] - best_z  # max z - best
+        low_error = best_z - model_arrays.zs[0]  # best - min z
         z = data.AsymmetricData(best_z, up_error, low_error)
         return z
 
@@ -713,25 +914,30 @@ class Cluster(object):
                       fitting. Needed to set the appropriate flag.
         :returns: None, but does set the cluster's flag variable if need be.
         """
+        nearby = np.asarray(nearby)
+        # We will compare each one to its 3 neighbors on each side, so we
+        # can't check the first or last 3 items.
+        if len(nearby) < 7:
+            return
+        item = nearby[3:-3]
+        # compare them all to their three neighbors on each side at once. If
+        # one is bigger than all 6 neighbors, call it a maxima.
+        is_maxima = ((item > nearby[:-6]) & (item > nearby[1:-5]) &
+                     (item >= nearby[2:-4]) & (item >= nearby[4:-2]) &
+                     (item > nearby[5:-1]) & (item > nearby[6:]))
+        # turn these into indices of nearby
+        maxima_idxs = np.flatnonzero(is_maxima) + 3
+
+        # Two maxima can be right next to each other if the top is flat. That
+        # obviously isn't what we are looking for here, so we ignore any
+        # maxima less than 3 after the last one we counted. There are only a
+        # few maxima, so a loop is fine here.
         num_local_maxima = 0
-        # We will compare each one to its 3 neighbors, so start as the third
-        # index.
-        idx = 3
-        # we can't go past the 4th to last item.
-        while 3 <= idx <= len(nearby) - 4:
-            item = nearby[idx]
-            # compare it to its three neighbors on each side.
-            if item > nearby[idx-3] and item > nearby[idx-2] and \
-               item >= nearby[idx-1] and item >= nearby[idx+1] and \
-               item > nearby[idx+2] and item > nearby[idx+3]:
-                # if it is bigger than all 6 neighbors, call it a maxima.
+        last_idx = -3
+        for idx in maxima_idxs:
+            if idx >= last_idx + 3:
                 num_local_maxima += 1
-                # move 3 ahead, to avoid the possibility of two maxima being
-                # right next to each other, which can happen if the top is
-                # flat. That obviously isn't what we are looking for here.
-                idx += 3
-            else:
-                idx += 1
+                last_idx = idx
         # If there are 2 or more maxima, increment the flag.
         if num_local_maxima >= 2:
             self.flags[color] += 2
@@ -775,23 +981,32 @@ class Cluster(object):
         :return: None, but galaxies that are RS members are marked as such.
         """
 
+        # pull everything we need out of the dictionaries once
+        color = cfg["color"]
+        red_mags = self._arr_mag[cfg["red_band"]]
+        colors = self._arr_color[color]
+
         # get the model, it's characteristic magnitude, and then turn it
         # into magnitude limits based on the parameters passed in
-        rs_model = self.models[cfg["color"]][redshift]
+        rs_model = self.models[color][redshift]
         char_mag = rs_model.mag_point
         dim_mag = char_mag + dimmer
         bright_mag = char_mag - brighter
 
-        for source in self.sources_list:
-            # get the color correspoinding to the red sequence at the ch2
-            # magnitude of this particular source
-            char_color = rs_model.rs_color(source.mags[cfg["red_band"]].value)
-            # turn it into color limits based on parameters passed in
-            red_color = char_color + redder
-            blue_color = char_color - bluer
-            # a function in the source class does the actual marking
-            source.rs_membership(blue_color, red_color, bright_mag, dim_mag,
-                                 cfg["color"], cfg["red_band"])
+        # get the color correspoinding to the red sequence at the red
+        # magnitude of each source
+        char_colors = rs_model.rs_color(red_mags)
+        # turn it into color limits based on parameters passed in
+        red_colors = char_colors + redder
+        blue_colors = char_colors - bluer
+
+        # then do the color and magnitude cuts on all the sources at once.
+        # Sources also need a color error below 0.2 to be members. That cut
+        # doesn't depend on the model, so it was done once in _build_arrays.
+        members = ((colors > blue_colors) & (colors < red_colors) &
+                   (red_mags > bright_mag) & (red_mags < dim_mag) &
+                   self._arr_good_color_err[color])
+        self._rs_member[color] = members
 
     def _chi_square_w_error(self, cfg):
         """Does chi-squared fitting, and returns the best fit value and the
@@ -806,64 +1021,69 @@ class Cluster(object):
         """
 
         # we only want to do the fitting on those near the center, and those
-        #  that are in our tentative RS.
-        to_fit = [source for source in self.sources_list
-                  if source.RS_member[cfg["color"]] and source.near_center]
+        #  that are in our tentative RS. We turn the mask into indices once,
+        # since we pull three arrays out with it.
+        to_fit = np.flatnonzero(self._rs_member[cfg["color"]] &
+                                self._near_center)
+        num_to_fit = len(to_fit)
 
         # if there isn't enough to fit to, keep the initial z. We need at
         # least two objects to do the chi squared calculation. This is because
         # we divide by number of objects - 2. More comments explain this when
         # this is done 20 lines below.
-        if len(to_fit) <= 2:
+        if num_to_fit <= 2:
             return self.z[cfg["color"]]
 
-        # initialize lists for the chi squared distribution and the redshifts
-        chi_sq_values = []
-        redshifts = []
-
-        # test each model
-        for z in sorted(self.models[cfg["color"]]):
-            chi_sq = 0  # reset the chi squared value for this model
-            this_model = self.models[cfg["color"]][z]
-            for source in to_fit:
-                # get the model points, then compare that with the data
-                model_color = this_model.rs_color(source.mags[cfg["red_band"]].value)
-                color = source.colors[cfg["color"]].value
-                error = source.colors[cfg["color"]].error
-                chi_sq += ((model_color - color)/error)**2
-
-            # reduce the chi square values. We will divide by the degrees of
-            # freedom, which = number of data points - number of parameters = 1
-            # here we have only 1 parameter (redshift), so it is just
-            # number of data points - 2. We can't divide by zero, and a
-            # number wouldn't make any sense, so we need at least 3 objects,
-            # which is why we have the check above.
-            chi_sq /= (len(to_fit) - 2)
-            # put these values into the lists, so we can keep track of them
-            chi_sq_values.append(chi_sq)
-            redshifts.append(z)
-
-        # get the minimum chi squared value, and it's index in the list.
-        best_chi = min(chi_sq_values)
-        best_chi_index = chi_sq_values.index(best_chi)
+        # get the data we are fitting, so we can compare it to all the models
+        # at once. These copies are contiguous, which is what the chi
+        # squared grid wants.
+        source_mags = self._arr_mag[cfg["red_band"]].take(to_fit)
+        colors = self._arr_color[cfg["color"]].take(to_fit)
+        errors = self._arr_color_err[cfg["color"]].take(to_fit)
+
+        # we test each model. All we need from them are the parameters of
+        # the line that describes the red sequence at each redshift.
+        model_arrays = self.model_arrays[cfg["color"]]
+        redshifts = model_arrays.zs
+        chi_sq_values = _chi2_grid(model_arrays.slopes,
+                                   model_arrays.mag_points,
+                                   model_arrays.color_points,
+                                   source_mags, colors, errors)
+
+        # reduce the chi square values. We will divide by the degrees of
+        # freedom, which = number of data points - number of parameters = 1
+        # here we have only 1 parameter (redshift), so it is just
+        # number of data points - 2. We can't divide by zero, and a
+        # number wouldn't make any sense, so we need at least 3 objects,
+        # which is why we have the check above.
+        chi_sq_values /= (num_to_fit - 2)
+
+        # get the minimum chi squared value, and it's index in the array.
+        best_chi_index = int(np.argmin(chi_sq_values))
+        best_chi = chi_sq_values[best_chi_index]
 
         # Start finding errors, using the chi squared distribution. Where it's
-        # one greater than the best chi, that's where the error is.
-        high_idx = best_chi_index
-        # find the place where the chi value is one greater than the best
-        while high_idx < len(chi_sq_values) - 1 and \
-                chi_sq_values[high_idx] - best_chi <= 1.0:
-            # Note: len(chi_sq_values) - 1 needs that -1 so that we don't
-            # end up with an high_idx that is past the end of chi_sq_values
-            high_idx += 1
-        # high_idx will now point to the first value where the chi squared
-        # value is one greater than the best fit value, or to the edge of the
-        # redshift range if no limit was found.
+        # one greater than the best chi, that's where the error is. The chi
+        # squared curve isn't always monotonic away from the minimum, so we
+        # can't do a binary search here. Instead we find all the places that
+        # are more than one above the best fit, then pick the closest ones on
+        # either side.
+        too_high = np.flatnonzero(chi_sq_values - best_chi > 1.0)
+
+        # the high error is at the first of those above the best fit. If there
+        # aren't any, it goes to the edge of the redshift range.
+        above = too_high[too_high > best_chi_index]
+        if len(above) > 0:
+            high_idx = int(above[0])
+        else:
+            high_idx = len(chi_sq_values) - 1
 
         # do the same thing for the low error
-        low_idx = best_chi_index
-        while low_idx > 0 and chi_sq_values[low_idx] - best_chi <= 1.0:
-            low_idx -= 1
+        below = too_high[too_high < best_chi_index]
+        if len(below) > 0:
+            low_idx = int(below[-1])
+        else:
+            low_idx = 0
 
         # now get the redshifts corresponding to the best fit, the low
         # error, and the high error
@@ -898,15 +1118,27 @@ class Cluster(object):
         brighter = cfg["final_rs_mag"][0]
         dimmer = cfg["final_rs_mag"][1]
 
-        # set the red sequence members for the accepted red sequence.
-        self._set_rs_membership(self.z[cfg["color"]].value,
-                                bluer=bluer, redder=redder,
-                                brighter=brighter, dimmer=dimmer,
-                                cfg=cfg)
+        # All three red sequences use the same model, so the magnitude cut,
+        # color error cut, and characteristic colors are the same for all of
+        # them. We only need to do those once. These are the same cuts that
+        # _set_rs_membership does, but we don't actually mark the galaxies
+        # as members, since we only want to count them.
+        color = cfg["color"]
+        red_mags = self._arr_mag[cfg["red_band"]]
+        colors = self._arr_color[color]
+        rs_model = self.models[color][self.z[color].value]
+        char_mag = rs_model.mag_point
+        passes_mag = ((red_mags > char_mag - brighter) &
+                      (red_mags < char_mag + dimmer) &
+                      self._arr_good_color_err[color])
+        char_colors = rs_model.rs_color(red_mags)
+
         # count the RS members in the best fit
-        best_rs = self._count_galaxies(cfg["color"])
+        best_rs = self._count_galaxies(passes_mag &
+                                       (colors > char_colors - bluer) &
+                                       (colors < char_colors + redder))
 
-        # set red sequence members to be in the color range redder then the
+        # Then count the galaxies in the color range redder then the
         # best fit red sequence. The blue limit is where the red limit used
         # to be, and the red limit is the same distance from the blue limit
         # that is used to be. This essentially creates an adjacent red
@@ -924,39 +1156,56 @@ class Cluster(object):
         blue_bluer = 2 * bluer + redder
 
         # red RS cut
-        self._set_rs_membership(self.z[cfg["color"]].value,
-                                bluer=red_bluer, redder=red_redder,
-                                brighter=brighter, dimmer=dimmer,
-                                cfg=cfg)
-        # again count the galaxies in this red sequence
-        red_rs = self._count_galaxies(cfg["color"])
+        red_rs = self._count_galaxies(passes_mag &
+                                      (colors > char_colors - red_bluer) &
+                                      (colors < char_colors + red_redder))
 
         # blue RS cut
-        self._set_rs_membership(self.z[cfg["color"]].value,
-                                bluer=blue_bluer, redder=blue_redder,
-                                brighter=brighter, dimmer=dimmer,
-                                cfg=cfg)
-        blue_rs = self._count_galaxies(cfg["color"])
+        blue_rs = self._count_galaxies(passes_mag &
+                                       (colors > char_colors - blue_bluer) &
+                                       (colors < char_colors + blue_redder))
 
         # Compare the numbers in the 3 red sequences. Set the flag if the
         # number of galaxies in the best red sequence is less than 1.5 times
         # the sum of the two offset red sequences. The 1.5 times is arbitrary.
         # It was chosen to make things I thought looked bad have this flag.
         if ((red_rs + blue_rs) * 1.5) >= best_rs:
-            self.flags[cfg["color"]] += 4
+            self.flags[color] += 4
+
+    def near_center(self):
+        """ Tells which sources passed the location cut.
+
+        :return: Boolean array with one entry per source, in the same order as
+                 the source list. If the location cut hasn't been done yet,
+                 every entry is False.
+        """
+        if self._near_center is None:
+            return np.zeros(len(self.sources_list), dtype=bool)
+        return self._near_center
+
+    def rs_members(self, color):
+        """ Tells which sources are red sequence members.
+
+        :param color: Color used to select the red sequence.
+        :return: Boolean array with one entry per source, in the same order as
+                 the source list. If the red sequence hasn't been selected in
+                 this color yet, every entry is False.
+        """
+        try:
+            return self._rs_member[color]
+        except KeyError:
+            return np.zeros(len(self.sources_list), dtype=bool)
 
-    def _count_galaxies(self, color):
+    def _count_galaxies(self, members):
         """ Counts the number of red sequence galaxies near the center.
 
+        :param members: Boolean array marking which sources are in the red
+                        sequence being counted.
         :return: number of red sequence galaxies that are near the center.
         :rtype: float. I return float so that it can be used in division in
                 Python 2.7 smartly.
         """
-        count = 0
-        for source in self.sources_list:
-            if source.near_center and source.RS_member[color]:
-                count += 1
-        return float(count)
+        return float(np.count_nonzero(members & self._near_center))
 
     def _location_check(self, color):
         """Looks to see if the red sequence galaxies are concentrated in the
@@ -971,21 +1220,18 @@ class Cluster(object):
         :returns: None, but the flag is set if need be.
         """
         # find how many objects are near then center and not near the center
-        # that are or are not red sequence members. I converted everything
-        # to floats to avoid the rounding that comes from dividing integers
-        # in Python 2.x
-        total_near_center = float(len([source for source in self.sources_list
-                                       if source.near_center]))
-        rs_near_center = float(len([source for source in self.sources_list
-                                    if source.near_center and
-                                    source.RS_member[color]]))
-
-        total_not_near_center = float(len([source for source in
-                                           self.sources_list if
-                                           not source.near_center]))
-        rs_not_near_center = float(len([source for source in self.sources_list
-                                        if not source.near_center and
-                                        source.RS_member[color]]))
+        # that are or are not red sequence members. The membership is kept in
+        # boolean arrays, so each of these is just a count of the True values
+        # in a mask. I converted everything to floats to avoid the rounding
+        # that comes from dividing integers in Python 2.x
+        near_center = self._near_center
+        rs_members = self._rs_member[color]
+        total_near_center = float(np.count_nonzero(near_center))
+        rs_near_center = self._count_galaxies(rs_members)
+
+        total_not_near_center = float(len(near_center)) - total_near_center
+        rs_not_near_center = float(np.count_nonzero(rs_members)) - \
+            rs_near_center
 
         # Calculate the percent of sources that are red sequence members both
         # near and far from the center.
@@ -1013,7 +1259,9 @@ class Cluster(object):
             params["extension"]
 
         try:
-            cat = open(filepath, "w")
+            # the catalog is all plain ASCII, so we write it as bytes. That
+            # skips the text layer, which would re-encode everything.
+            cat = open(filepath, "wb")
         except IOError:
             raise IOError("The location to save the RS catalogs could not\n"
                           "\tbe located. Make sure you specified the \n"
@@ -1027,11 +1275,10 @@ class Cluster(object):
         # first add ra and dec
         header = "# {:<12s} {:<12s}".format("ra", "dec")
 
-        # also make a general formatters that will be used later for ra/dec
-        coords_formatter = "  {:<12.7f} {:<12.7f}"
+        # the bands are written in the same order as they were read in.
+        bands = list(self._arr_mag)
 
-        phot_formatter = " {:<15.3f} {:<15.3f}"
-        for band in self.sources_list[0].mags:
+        for band in bands:
             band = band.replace("sloan_", "")  # we don't care about the sloan
             # add these bands to the header
             header += " {:<15s} {:<15s}".format(band + "_" + d_type,
@@ -1044,42 +1291,83 @@ class Cluster(object):
         for color in self.z:
             header += rs_formatter.format("RS_" + color.replace("sloan_", ""))
 
-        # I want the headers to line up over the data
-        cat.write(header + "\n")
-
-        # then we can write all the sources to the catalog.
-        for source in self.sources_list:
-            # start by adding the ra/dec
-            line = coords_formatter.format(source.ra, source.dec)
-
-            # then add all the photometry
-            for band in source.mags:
-                mag = source.mags[band].value
-                magerr = source.mags[band].error
-                if d_type == "mag":
-                    # we don't have to convert to flux
-                    if params["mag_system"] == "ab":
-                        line += phot_formatter.format(mag, magerr)
-                    else:
-                        mag += config.ab_to_vega[band]  # convert to Vega
-                        line += phot_formatter.format(mag, magerr)
-                else:
-                    # convert to flux before writing to catalog
-                    flux = self.mag_to_flux(mag, params["mag_zeropoint"])
-                    fluxerr = self.mag_errors_to_flux_errors(magerr, flux)
+        # I want the headers to line up over the data. The header is written
+        # along with the data at the end.
+        header += "\n"
 
-                    line += phot_formatter.format(flux, fluxerr)
+        # The data comes from the cluster's arrays, rather than from each
+        # source. We do all the unit conversions on the whole columns at once.
+        # Which conversion we need is the same for every source, so figure
+        # that out first. The Vega offsets are the same ones that were taken
+        # off when the catalog was read, so adding them back gives the mags
+        # in the system the user gave us. They are zero for AB mags.
+        vega_offsets = self._vega_offsets(params, bands)
+        zeropoint = params["mag_zeropoint"]
 
-            # add whether or not it's centered
-            line += center_formatter.format(source.near_center)
+        columns = [self._arr_ra, self._arr_dec]
+        for band in bands:
+            mags = self._arr_mag[band]
+            magerrs = self._arr_mag_err[band]
+            if d_type == "mag":
+                # we don't have to convert to flux
+                if vega_offsets[band] != 0:
+                    mags = mags + vega_offsets[band]  # convert to Vega
+                columns += [mags, magerrs]
+            else:
+                # convert to flux before writing to catalog
+                fluxes = self.mag_to_flux_arr(mags, zeropoint)
+                fluxerrs = self.mag_errors_to_flux_errors_arr(magerrs, fluxes)
+                columns += [fluxes, fluxerrs]
+
+        # whether or not each source is centered, then the RS information.
+        # These are written as 1 or 0. If the location cut hasn't been done,
+        # nothing is centered.
+        if self._near_center is None:
+            columns.append(np.zeros(len(self.sources_list)))
+        else:
+            columns.append(self._near_center)
+        for color in self.z:
+            columns.append(self._rs_member[color])
+
+        # The lines have the same layout as the header. We use % formatting
+        # here, since that lets us format the whole catalog in one go: we
+        # repeat the format of one line once for every source, then fill it
+        # with all the values in order. %d writes the True/False columns as
+        # 1 or 0.
+        line_formatter = _RS_COORDS_FMT + _RS_PHOT_FMT * len(bands) + \
+            _RS_CENTER_FMT + _RS_MEMBER_FMT * len(self.z) + b"\n"
+        values = np.column_stack(columns).astype(np.float64)
+        lines = (line_formatter * len(values)) % \
+            tuple(values.ravel().tolist())
+        # the header and all the lines go into the file in one write. The
+        # lines are already bytes.
+        cat.write(header.encode("ascii") + lines)
+        cat.close()
 
-            # then add RS information
-            for color in self.z:
-                line += rs_formatter.format(source.RS_member[color])
 
-            line += "\n"
-            cat.write(line)
-        cat.close()
+def _chi2_grid(slopes, mag_points, color_points, mags, colors, errors):
+    """
+    Calculates the chi-squared value of the data compared to the red sequence
+    model at each redshift.
+
+    This makes a 2D array of model colors, where the first index is the
+    redshift and the second is the source, then compares it to the data.
+
+    :param slopes: Array with the slope of the red sequence at each redshift.
+    :param mag_points: Array with the characteristic magnitude of the red
+                       sequence at each redshift.
+    :param color_points: Array with the color of the red sequence at the
+                         characteristic magnitude at each redshift.
+    :param mags: Array with the red magnitudes of the sources being fit.
+    :param colors: Array with the colors of the sources being fit.
+    :param errors: Array with the errors on the colors of the sources.
+    :return: Array with the chi-squared value at each redshift. This is not
+             reduced, that is left to the caller.
+    """
+    # same point slope form that RSModel.rs_color uses.
+    model_colors = color_points[:, None] + \
+        slopes[:, None] * (mags[None, :] - mag_points[:, None])
+    return (((model_colors - colors) / errors)**2).sum(axis=1)
 
 
 def save_as_one_pdf(figs, filename):
@@ -1095,17 +1383,25 @@ def save_as_one_pdf(figs, filename):
     if len(figs) == 0:
         return
 
-    # if so, save them.
+    # if so, save them. Each figure is closed as soon as it is saved, so
+    # its memory can be freed right away.
+    with open_pdf(filename) as pp:
+        for fig in figs:
+            pp.savefig(fig)
+            plt.close(fig)
+
+
+def open_pdf(filename):
+    """
+    Open a PDF file that figures can be saved into one at a time.
+
+    :param filename: place where the PDF will be saved
+    :return: PdfPages object. Call its close() method when done with it.
+    """
     try:
-        pp = PdfPages(filename)
+        return PdfPages(filename)
     except IOError:
         raise IOError("The location to save the plots could not be found.\n"
                       "\tMake sure you specified the 'plot_directory'\n"
                       "\tparameter appropriately. The code will create\n"
                       "\tnew files, but not new directories.")
-
-    for fig in figs:
-        pp.savefig(fig)
-    pp.close()
-    for fig in figs:
-        plt.close(fig)
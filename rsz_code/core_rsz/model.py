@@ -106,14 +106,23 @@ class RSModel(object):
         self._slope_obj = _Slope(cfg)
         self._slope = self._slope_obj(redshift)
 
+    @property
+    def slope(self):
+        """
+        Slope of the red sequence at this redshift, in color per magnitude.
+        """
+        return self._slope
+
     def rs_color(self, red_mag):
         """
         Calculate the color of the red sequence at the given red_mag
         magnitude.
 
         :param red_mag: red magnitude at which we want the color of the
-                        red sequence
-        :return: float value with the color of the red sequence
+                        red sequence. This can also be an array of
+                        magnitudes.
+        :return: float value with the color of the red sequence, or an array
+                 of them if red_mag was an array.
 
         Algorithm: Start with point slope form of a line
         y - y1 = m(x - x1)
@@ -121,11 +130,56 @@ class RSModel(object):
         Where x is red magnitude, y is color, m is the slope of the
         red sequence, and x1 and y1 are the zero point that was returned by
         EzGal.
+
+        This is just a line, so it is about as cheap as it can get. There is
+        no point in tabulating it on a grid and interpolating, since that
+        would be slower and less accurate than evaluating it directly.
         """
 
         return self.color_point + self._slope * (red_mag - self.mag_point)
 
 
+class RSModelArrays(object):
+    """
+    Class storing the red sequence models of one color at all redshifts as
+    arrays, so that all the models can be compared to data at once.
+
+    Every array is sorted in order of increasing redshift, so the same index
+    refers to the same model in all of them.
+    """
+
+    def __init__(self, models):
+        """
+        Pulls the parameters of the red sequence line out of the models.
+
+        :param models: Dictionary with keys of redshift and values of
+                       RSModel objects, like one of the values of the
+                       dictionary returned by model_dict().
+        """
+        self.zs = sorted(models)
+        self.slopes = np.array([models[z].slope for z in self.zs])
+        self.mag_points = np.array([models[z].mag_point for z in self.zs])
+        self.color_points = np.array([models[z].color_point
+                                      for z in self.zs])
+
+    def rs_colors(self, red_mags):
+        """
+        Calculate the color of the red sequence of every model at the given
+        red magnitudes.
+
+        This is the same calculation as RSModel.rs_color, just done for all
+        the models at once.
+
+        :param red_mags: Array of red magnitudes at which we want the color
+                         of the red sequence.
+        :return: 2D array of red sequence colors. The first index is the
+                 redshift, and the second is the magnitude.
+        """
+        return self.color_points[:, None] + \
+            self.slopes[:, None] * (red_mags[None, :] -
+                                    self.mag_points[:, None])
+
+
 def model_dict(spacing):
     """
     Create a dictionary of model objects, that represent the red sequence at
@@ -209,6 +263,21 @@ def model_dict(spacing):
     return rs_models
 
 
+def model_arrays(models):
+    """
+    Turn a dictionary of models into RSModelArrays objects.
+
+    :param models: Dictionary of models, as returned by model_dict().
+    :return: dictionary with keys of the different color combinations used
+             (ex: ch1-ch2), and values of RSModelArrays objects holding the
+             models at all redshifts in that color.
+    """
+    arrays = dict()
+    for color in models:
+        arrays[color] = RSModelArrays(models[color])
+    return arrays
+
+
 def _make_model(filters):
     """
     Make an EzGal object.
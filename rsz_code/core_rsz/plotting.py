@@ -29,27 +29,29 @@ def cmd(cluster, ax, cfg):
     :return:  axis objects for the plot
     """
 
-    # throw out a few sources that don't need to be plotted.
-    valid_sources = [source for source in cluster.sources_list if
-                     source.near_center and
-                     (source.colors[cfg["color"]]).error < 0.2]
-
-    # plot points one by one, so I don't have to make long lists for each
-    # thing I want to plot. This is simpler, since I would need 6 lists.
-    for source in valid_sources:
-        mag = source.mags[cfg["red_band"]].value
-        source_color = source.colors[cfg["color"]]
-        # red sequence members will be colored red, while non RS galaxies
-        # will be colored black.
-        try:  # if RS membership hasn't been created yet, the key wont exist
-            if source.RS_member[cfg["color"]]:
-                point_color = nice_red
-            else:
-                point_color = "k"
-        except KeyError:  # RS hasn't been set yet, so all are black.
-            point_color = "k"
-
-        ax.errorbar(x=mag, y=source_color.value, yerr=source_color.error,
+    # throw out a few sources that don't need to be plotted. We keep track of
+    # which of them are RS members as we go. If RS membership hasn't been
+    # created yet, none of them are.
+    rs_members = cluster.rs_members(cfg["color"]).tolist()
+    near_center = cluster.near_center().tolist()
+    valid_sources = [(source, is_rs) for source, is_rs, is_near in
+                     zip(cluster.sources_list, rs_members, near_center) if
+                     is_near and (source.colors[cfg["color"]]).error < 0.2]
+
+    # red sequence members will be colored red, while non RS galaxies will be
+    # colored black. Plotting each group with one call is much faster than
+    # plotting the points one by one.
+    for is_rs, point_color in [(False, "k"), (True, nice_red)]:
+        group = [source for source, source_is_rs in valid_sources
+                 if source_is_rs == is_rs]
+        if len(group) == 0:
+            continue
+
+        mags = [source.mags[cfg["red_band"]].value for source in group]
+        colors = [source.colors[cfg["color"]].value for source in group]
+        color_errs = [source.colors[cfg["color"]].error for source in group]
+
+        ax.errorbar(x=mags, y=colors, yerr=color_errs,
                     c=point_color, fmt=".", elinewidth=0.35, capsize=0,
                     markersize=5)
 
@@ -247,11 +249,14 @@ def location(cluster, ax, color):
     rs_member_ra, rs_member_dec = [], []
     center_ra, center_dec = [], []
     rest_ra, rest_dec = [], []
-    for source in cluster.sources_list:
-        if source.RS_member[color]:
+    rs_members = cluster.rs_members(color).tolist()
+    near_center = cluster.near_center().tolist()
+    for source, is_rs, is_near in zip(cluster.sources_list, rs_members,
+                                      near_center):
+        if is_rs:
             rs_member_ra.append(source.ra)
             rs_member_dec.append(source.dec)
-        elif source.near_center:
+        elif is_near:
             center_ra.append(source.ra)
             center_dec.append(source.dec)
         else:
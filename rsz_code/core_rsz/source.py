@@ -46,26 +46,3 @@ class Source(object):
             for band_2 in self.mags:
                 color = "{}-{}".format(band_1, band_2)
                 self.colors[color] = self.mags[band_1] - self.mags[band_2]
-
-    def rs_membership(self, blue, red, bright, faint, color, red_band):
-        """Mark sources as red sequence members if they pass the given cuts.
-
-        Sources will be marked as red sequence members if they have a color
-        between blue and red, and a magnitude between bright and faint.
-
-        Also does an error cut on the color.
-
-        :param color: Which color we are using to determin RS membership.
-        :param blue: bluest color a source can be to be a RS member
-        :param red: reddest color a source can be to be a RS member
-        :param bright: brightest magnitude "" "" "" "" "" "" ""
-        :param faint: dimmest magnitude "" "" "" "" "" "" ""
-        :param red_band: Name of the redder band being used in the fitting.
-        :return: None, but some sources will be marked as RS members.
-        """
-        if blue < self.colors[color] < red and \
-                bright < self.mags[red_band] < faint and \
-                self.colors[color].error < 0.2:
-            self.RS_member[color] = True
-        else:
-            self.RS_member[color] = False